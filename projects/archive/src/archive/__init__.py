@@ -1,6 +1,6 @@
 """Module for loading and managing version information."""
 
-from archive.download import download_source, extract_archive
+from archive.download import ChecksumError, download_source, extract_archive
 from archive.versions import (
     Source,
     Version,
@@ -10,9 +10,11 @@ from archive.versions import (
     get_versions,
     get_versions_by_type,
     latest_version,
+    latest_version_by_type,
 )
 
 __all__ = [
+    "ChecksumError",
     "Source",
     "Version",
     "compare_version_urls",
@@ -23,4 +25,5 @@ __all__ = [
     "get_versions",
     "get_versions_by_type",
     "latest_version",
+    "latest_version_by_type",
 ]
@@ -2,47 +2,133 @@
 
 from __future__ import annotations
 
+from functools import cache
 from hashlib import sha256
-from io import BytesIO
 from logging import getLogger
-from typing import TYPE_CHECKING
-from zipfile import ZipFile
-
-from requests import get
+from os.path import altsep, curdir, pardir, sep, splitdrive
+from shutil import copyfileobj
+from tempfile import SpooledTemporaryFile
+from typing import IO, TYPE_CHECKING
+from zipfile import ZipFile, ZipInfo
 
 if TYPE_CHECKING:
     from pathlib import Path
 
+    from requests import Session
+
     from archive import Source
 
 logger = getLogger(__name__)
 
+# Size of the chunks read from the response while downloading, and when extracting
+CHUNK_SIZE = 1 << 20
+# Archives larger than this are spooled to a temporary file rather than memory
+SPOOL_SIZE = 64 << 20
+# Characters that are not allowed in Windows file names, replaced as by extractall
+WINDOWS_INVALID_CHARACTERS = str.maketrans(':<>|"?*', "_______")
+
+
+class ChecksumError(ValueError):
+    """Raised when a downloaded archive does not match its expected checksum."""
 
-def verify_checksum(data: bytes, checksum: str) -> bool:
-    """Verify the checksum of the data."""
+
+def verify_checksum(digest: str, checksum: str) -> bool:
+    """Verify the checksum against the hex digest of the data."""
     if not checksum.startswith("sha256:"):
         logger.error("Invalid checksum format: %s", checksum)
         return False
 
-    return checksum == f"sha256:{sha256(data).hexdigest()}"
+    return checksum == f"sha256:{digest}"
+
+
+@cache
+def http_session() -> Session:
+    """Get the HTTP session shared by downloads, reusing its connections."""
+    # Imported here so that listing versions doesn't load the HTTP stack
+    from requests import Session
 
+    return Session()
 
-def download_source(source: Source) -> BytesIO:
+
+def download_source(source: Source) -> IO[bytes]:
     """Download the zip file containing the DPM database."""
-    response = get(source["url"], timeout=30, allow_redirects=True)
-    response.raise_for_status()
+    archive = SpooledTemporaryFile(max_size=SPOOL_SIZE)  # noqa: SIM115
+    digest = sha256()
+    # The archive is hashed while it is streamed, without holding a second copy
+    try:
+        with http_session().get(
+            source["url"],
+            timeout=30,
+            allow_redirects=True,
+            stream=True,
+        ) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(CHUNK_SIZE):
+                digest.update(chunk)
+                archive.write(chunk)
+    except BaseException:
+        # The spooled file may have spilled to disk, so it is removed on failure
+        archive.close()
+        raise
+    archive.seek(0)
 
     if checksum := source.get("checksum"):
-        if not verify_checksum(response.content, checksum):
-            logger.warning("Checksum verification failed")
+        hexdigest = digest.hexdigest()
+        if not verify_checksum(hexdigest, checksum):
+            # The archive is discarded before anything is extracted from it
+            archive.close()
+            msg = f"Checksum mismatch: expected {checksum}, got sha256:{hexdigest}"
+            raise ChecksumError(msg)
     else:
         logger.warning("No checksum provided")
 
-    return BytesIO(response.content)
+    return archive
+
+
+def member_path(member: ZipInfo, target: Path) -> Path:
+    """Get the extraction path of an archive member, sanitised like extractall.
+
+    Drives, absolute paths and relative parts are dropped from the member name, and
+    on Windows invalid characters are replaced, so every member lands inside target.
+    """
+    name = member.filename.replace("/", sep)
+    if altsep:
+        name = name.replace(altsep, sep)
+    parts = [
+        part
+        for part in splitdrive(name)[1].split(sep)
+        if part not in ("", curdir, pardir)
+    ]
+    if sep == "\\":
+        windows_parts = (
+            part.translate(WINDOWS_INVALID_CHARACTERS).rstrip(" .") for part in parts
+        )
+        parts = [part for part in windows_parts if part]
+    if not parts and not member.is_dir():
+        msg = f"Archive member {member.filename} has an empty file name"
+        raise ValueError(msg)
 
+    path = target.joinpath(*parts).resolve()
+    # Sanitised names stay inside target, this guards against anything missed
+    if not path.is_relative_to(target.resolve()):
+        msg = f"Archive member {member.filename} is outside of {target}"
+        raise ValueError(msg)
+    return path
 
-def extract_archive(archive: BytesIO, target: Path) -> None:
+
+def extract_archive(archive: IO[bytes], target: Path) -> None:
     """Extract files from the archive to the target with the given name."""
     with ZipFile(archive) as zip_file:
-        target.mkdir(parents=True, exist_ok=True)
-        zip_file.extractall(target)
+        members = [(info, member_path(info, target)) for info in zip_file.infolist()]
+
+        # Each distinct directory is created once, sorted so parents come first
+        directories = {path if info.is_dir() else path.parent for info, path in members}
+        for directory in sorted({target.resolve(), *directories}):
+            directory.mkdir(parents=True, exist_ok=True)
+
+        for info, path in members:
+            if info.is_dir():
+                continue
+            # Members are copied with large chunks rather than the default buffer
+            with zip_file.open(info) as source, path.open("wb") as destination:
+                copyfileobj(source, destination, CHUNK_SIZE)
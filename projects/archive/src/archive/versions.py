@@ -1,7 +1,9 @@
 """Module for loading and managing version information."""
 
 from collections import defaultdict
+from collections.abc import Iterable
 from datetime import date
+from operator import itemgetter
 from pathlib import Path
 from tomllib import load
 from typing import Literal, NotRequired, TypedDict
@@ -46,9 +48,14 @@ def get_versions_by_type(versions: Versions, *version_types: str) -> Versions:
     return [v for v in versions if v["type"] in version_types]
 
 
-def latest_version(versions: Versions) -> Version:
+def latest_version(versions: Iterable[Version]) -> Version:
     """Get the latest version from the given versions."""
-    return max(versions, key=lambda version: version["date"])
+    return max(versions, key=itemgetter("date"))
+
+
+def latest_version_by_type(versions: Versions, *version_types: str) -> Version:
+    """Get the latest version of the given types, in a single pass."""
+    return latest_version(v for v in versions if v["type"] in version_types)
 
 
 def get_version(versions: Versions, version_id: str) -> Version | None:
@@ -1,15 +1,20 @@
 """Main module for database conversion."""
 
+from contextlib import closing
 from datetime import UTC, datetime
 from logging import getLogger
 from pathlib import Path
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 
 from migrate.processing import (
+    IN_MEMORY_LIMIT,
+    PREFETCH_TABLES,
     create_access_engine,
+    create_staging_engine,
     extract_schema_and_data,
     load_data,
+    prefetch,
 )
 
 logger = getLogger(__name__)
@@ -41,18 +46,32 @@ def migrate_to_sqlite(source: Path, target: Path) -> None:
 
     logger.info("Processing: %s", source.stem)
 
-    access = create_access_engine(source)
-    metadata, tables = extract_schema_and_data(access)
-
     target.parent.mkdir(parents=True, exist_ok=True)
 
-    sqlite = create_engine("sqlite:///:memory:")
-    metadata.create_all(sqlite)
-    load_data(sqlite, tables)
-
-    with sqlite.connect() as connection:
-        connection.execute(text(f"VACUUM INTO '{target}'"))
-        logger.info("Saved: %s", target)
+    access = create_access_engine(source)
+    # Each table is loaded while the next ones are being extracted, closing stops
+    # the extraction and releases the source connection if loading fails
+    with closing(
+        prefetch(extract_schema_and_data(access), PREFETCH_TABLES),
+    ) as tables:
+        staging: Path | None = None
+        if source.stat().st_size > IN_MEMORY_LIMIT:
+            # Large databases are staged in a file to avoid holding them in memory
+            staging = target.with_name(f"{target.name}.partial")
+            # A staging file left by an interrupted run is started over
+            staging.unlink(missing_ok=True)
+
+        sqlite = create_staging_engine(staging)
+        try:
+            load_data(sqlite, tables)
+            # The target is only written once loading succeeded, compacted either way
+            with sqlite.connect() as connection:
+                connection.execute(text(f"VACUUM INTO '{target}'"))
+        finally:
+            sqlite.dispose()
+            if staging is not None:
+                staging.unlink(missing_ok=True)
+    logger.info("Saved: %s", target)
 
     stop_time = datetime.now(UTC)
     logger.info("Migrated database in %s", stop_time - start_time)
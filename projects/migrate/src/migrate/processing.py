@@ -1,9 +1,15 @@
 """Database processing utilities for handling multiple Access databases."""
 
+from collections.abc import Generator, Iterable
+from itertools import batched
 from logging import getLogger
 from pathlib import Path
+from queue import Full, Queue
+from threading import Event, Thread
 
 from sqlalchemy import Engine, MetaData, Table, create_engine, event, insert, select
+from sqlalchemy.engine.interfaces import DBAPIConnection
+from sqlalchemy.pool import ConnectionPoolEntry
 
 from migrate.transformations import (
     TableData,
@@ -16,7 +22,29 @@ from migrate.transformations import (
 
 logger = getLogger(__name__)
 
-type TableDataMap = list[tuple[Table, TableData]]
+type TableDataMap = Iterable[tuple[Table, TableData]]
+# Items passed from the prefetch thread, wrapped so that None can end the stream
+type PrefetchEntry[T] = tuple[T] | BaseException | None
+
+# Rows fetched from the source per round trip, bounding the driver side buffer
+FETCH_SIZE = 10_000
+# Field values per executemany call, wide tables get fewer rows so that each batch
+# holds a similar amount of bound data in memory
+LOAD_BATCH_VALUES = 32_000
+# Tables extracted ahead of the one being loaded, bounding memory use
+PREFETCH_TABLES = 2
+# Seconds the prefetch thread waits on a full buffer before checking for a stop
+PREFETCH_TIMEOUT = 0.1
+# Largest source database, in bytes, that is staged in memory before saving
+IN_MEMORY_LIMIT = 1 << 30
+
+# The database is built from scratch in one go, so durability is not needed
+BULK_LOAD_PRAGMAS = (
+    "PRAGMA journal_mode = OFF",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA locking_mode = EXCLUSIVE",
+)
 
 
 def create_access_engine(db: Path) -> Engine:
@@ -26,6 +54,29 @@ def create_access_engine(db: Path) -> Engine:
     return create_engine(f"access+pyodbc:///?odbc_connect={conn_str}")
 
 
+def set_bulk_load_pragmas(
+    connection: DBAPIConnection,
+    _record: ConnectionPoolEntry,
+) -> None:
+    """Configure the connection for bulk loading."""
+    cursor = connection.cursor()
+    for pragma in BULK_LOAD_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def create_staging_engine(db: Path | None = None) -> Engine:
+    """Get an engine to a SQLite database tuned for bulk loading.
+
+    Args:
+        db: Path of the database file, an in-memory database is used if omitted
+
+    """
+    engine = create_engine(f"sqlite:///{db or ':memory:'}")
+    event.listen(engine, "connect", set_bulk_load_pragmas)
+    return engine
+
+
 def reflect_schema(source: Engine) -> MetaData:
     """Reflect a database schema."""
     metadata = MetaData()
@@ -34,23 +85,24 @@ def reflect_schema(source: Engine) -> MetaData:
     return metadata
 
 
-def extract_schema_and_data(source: Engine) -> tuple[MetaData, TableDataMap]:
+def extract_schema_and_data(source: Engine) -> Generator[tuple[Table, TableData]]:
     """Extract data and schema from a single Access database.
 
     Args:
         source: Engine to the source Access database
 
-    Returns:
-        MetaData: Database metadata
+    Yields:
+        Table: Table with its schema refined from the data
         TableData: Table rows
 
     """
     metadata = reflect_schema(source)
 
-    tables: TableDataMap = []
     with source.begin() as connection:
         for table in metadata.tables.values():
-            data = connection.execute(select(table)).all()
+            # Rows are streamed into parse instead of materialising the result set
+            query = select(table).execution_options(yield_per=FETCH_SIZE)
+            data = connection.execute(query)
             rows, enums, nullables = parse(data)
 
             # Clear indexes to avoid name collisions and save space
@@ -63,14 +115,68 @@ def extract_schema_and_data(source: Engine) -> tuple[MetaData, TableDataMap]:
             mark_non_nullable(table, nullables)
             add_foreign_keys(table)
 
-            if rows:
-                tables.append((table, rows))
+            yield table, rows
+
+
+def put_entry[T](
+    buffer: Queue[PrefetchEntry[T]],
+    stop: Event,
+    entry: PrefetchEntry[T],
+) -> bool:
+    """Put an entry in the buffer, giving up once the consumer has stopped."""
+    while not stop.is_set():
+        try:
+            buffer.put(entry, timeout=PREFETCH_TIMEOUT)
+        except Full:
+            continue
+        return True
+    return False
+
+
+def produce[T](
+    items: Generator[T],
+    buffer: Queue[PrefetchEntry[T]],
+    stop: Event,
+) -> None:
+    """Feed items into the buffer until they run out or the consumer stops."""
+    try:
+        for item in items:
+            if not put_entry(buffer, stop, (item,)):
+                return
+    except BaseException as error:  # noqa: BLE001 - re-raised in the consumer
+        put_entry(buffer, stop, error)
+    else:
+        put_entry(buffer, stop, None)
+    finally:
+        # Closing the generator releases the resources it holds, like connections
+        items.close()
+
+
+def prefetch[T](items: Generator[T], size: int) -> Generator[T]:
+    """Iterate items produced in a background thread, buffering up to size ahead.
+
+    This overlaps reading the source database with writing to the target. When the
+    consumer stops early, the producer stops too and closes the items generator.
+    """
+    buffer: Queue[PrefetchEntry[T]] = Queue(maxsize=size)
+    stop = Event()
 
-    return metadata, tables
+    Thread(target=produce, args=(items, buffer, stop), daemon=True).start()
+    try:
+        while (entry := buffer.get()) is not None:
+            if isinstance(entry, BaseException):
+                raise entry
+            yield entry[0]
+    finally:
+        stop.set()
 
 
 def load_data(target: Engine, tables: TableDataMap) -> None:
-    """Populate the target database with data from the source database."""
+    """Create each table in the target database and populate it with its rows."""
     with target.begin() as connection:
         for table, data in tables:
-            connection.execute(insert(table), data)
+            table.create(connection)
+            statement = insert(table)
+            batch_size = max(1, LOAD_BATCH_VALUES // len(table.columns))
+            for batch in batched(data, batch_size, strict=False):
+                connection.execute(statement, batch)
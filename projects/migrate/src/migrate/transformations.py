@@ -1,8 +1,8 @@
 """Schema transformation utilities for database conversion."""
 
-from collections import defaultdict
-from collections.abc import Callable, Sequence
+from collections.abc import Callable, Iterable
 from datetime import date, datetime
+from functools import cache
 from typing import Any, NotRequired, TypedDict
 
 from sqlalchemy import (
@@ -25,14 +25,15 @@ type TableRow = dict[str, FieldValue]
 type TableData = list[TableRow]
 type ColumnNames = set[str]
 type ColumnEnumMap = dict[str, set[str]]
-type Rows = Sequence[Row[Any]]
+type Rows = Iterable[Row[Any]]
+type Caster = Callable[[FieldValue], FieldValue]
 
 
 class ColumnType(TypedDict):
     """Column type mapping."""
 
     sql: TypeEngine[Any]
-    python: NotRequired[Callable[[FieldValue], FieldValue]]
+    python: NotRequired[Caster]
 
 
 # Mapping specific column names to their appropriate types
@@ -44,21 +45,26 @@ COLUMN_TYPE_OVERRIDES: dict[str, ColumnType] = {
 }
 
 
+# Column names repeat across tables and passes, so classifications are cached
+@cache
 def is_guid(column: str) -> bool:
     """Check if a column is a GUID column."""
     return column.lower().endswith("guid")
 
 
+@cache
 def is_bool(column: str) -> bool:
     """Check if a column is a boolean column."""
     return column.lower().startswith(("is", "has"))
 
 
+@cache
 def is_date(column: str) -> bool:
     """Check if a column is a date column."""
     return column.lower().endswith("date")
 
 
+@cache
 def is_enum(column: str) -> bool:
     """Check if a column is an enum column."""
     return column.lower().endswith(
@@ -104,37 +110,67 @@ def genericize(_i: Inspector, _t: str, column: ReflectedColumn) -> None:
     column["type"] = column_type
 
 
-def cast_value(column: str, value: FieldValue) -> FieldValue:
-    """Transform row values to appropriate Python types."""
-    if value is None:
-        return None
+def keep_value(value: FieldValue) -> FieldValue:
+    """Keep a value as returned by the source database."""
+    return value
+
+
+def cast_date(value: FieldValue) -> FieldValue:
+    """Parse ISO formatted date strings."""
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def get_caster(column: str) -> Caster:
+    """Get the function transforming values of a column to its Python type."""
     if column in COLUMN_TYPE_OVERRIDES and (
         caster := COLUMN_TYPE_OVERRIDES[column].get("python")
     ):
-        return caster(value)
-    if is_date(column) and isinstance(value, str):
-        return date.fromisoformat(value)
+        return caster
+    if is_date(column):
+        return cast_date
     if is_bool(column):
-        return bool(value)
-    return value
+        return bool
+    return keep_value
 
 
 def parse(table_rows: Rows) -> tuple[TableData, ColumnEnumMap, ColumnNames]:
     """Transform row values to appropriate Python types."""
     rows: TableData = []
-    enums: ColumnEnumMap = defaultdict(set)
+    enums: ColumnEnumMap = {}
     nullables: ColumnNames = set()
+    # Column handling is resolved once from the first row, not for every value
+    columns: tuple[str, ...] = ()
+    casters: tuple[Caster, ...] = ()
+    enum_adders: tuple[Callable[[str], None] | None, ...] = ()
     for table_row in table_rows:
-        row = table_row._asdict()  # pyright: ignore[reportPrivateUsage]
-        rows.append(row)
-        for column in row:
-            new_value = cast_value(column, row[column])
-            row[column] = new_value
-            if is_enum(column) and isinstance(new_value, str):
-                enums[column].add(new_value)
+        if not columns:
+            columns = table_row._fields  # pyright: ignore[reportPrivateUsage]
+            casters = tuple(get_caster(column) for column in columns)
+            enums = {column: set() for column in columns if is_enum(column)}
+            enum_adders = tuple(
+                enums[column].add if column in enums else None for column in columns
+            )
+
+        values: list[FieldValue] = []
+        for column, caster, add_enum, value in zip(
+            columns,
+            casters,
+            enum_adders,
+            table_row,
+            strict=True,
+        ):
+            new_value = None if value is None else caster(value)
+            values.append(new_value)
             if new_value is None:
                 nullables.add(column)
+            elif add_enum and isinstance(new_value, str):
+                add_enum(new_value)
+
+        # Rows are built once from the cast values rather than copied and updated
+        rows.append(dict(zip(columns, values, strict=True)))
 
+    # Enum columns without any values are left with their reflected type
+    enums = {column: found for column, found in enums.items() if found}
     return rows, enums, nullables
 
 
@@ -1,12 +1,13 @@
 """Model generator for generating SQLAlchemy models from database metadata."""
 
 import keyword
+import re
 import warnings
 from collections import defaultdict
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 from datetime import date, datetime
 from decimal import Decimal
-from re import sub
+from functools import cache, cached_property
 from typing import Any
 from uuid import UUID
 
@@ -15,25 +16,45 @@ from sqlalchemy.exc import SAWarning
 
 INDENT = "    "
 
+# Python types that need an import in the TYPE_CHECKING block, by module and name
+TYPING_IMPORTS: dict[type, tuple[str, str]] = {
+    date: ("datetime", "date"),
+    datetime: ("datetime", "datetime"),
+    Decimal: ("decimal", "Decimal"),
+    UUID: ("uuid", "UUID"),
+}
 
+SNAKE_CASE_PATTERN = re.compile("([a-z0-9])([A-Z])|([A-Z])([A-Z][a-z])")
+
+
+# Names are cached as the same table and column names are normalised many times
+@cache
 def pascal_case(name: str) -> str:
     """Normalise table names to PascalCase."""
     return "".join(word[0].upper() + word[1:] for word in name.split("_"))
 
 
+@cache
 def relation_name(name: str) -> str:
     """Normalise relation names."""
     return name.removesuffix("GUID").replace("VID", "Version").removesuffix("ID")
 
 
+@cache
 def snake_case(name: str) -> str:
     """Convert a name to snake_case."""
-    return sub("([a-z0-9])([A-Z])|([A-Z])([A-Z][a-z])", r"\1\3_\2\4", name).lower()
+    return SNAKE_CASE_PATTERN.sub(r"\1\3_\2\4", name).lower()
+
 
+@cache
+def quoted_values(values: tuple[str, ...]) -> str:
+    """Render values sorted and quoted, once for each distinct set of values."""
+    return ", ".join(sorted(f'"{value}"' for value in values))
 
-def foreign_key(key: str) -> str:
-    """Render a foreign key."""
-    return f"ForeignKey({key})"
+
+def enum_values(enum: Enum) -> str:
+    """Get the sorted and quoted values of an enum."""
+    return quoted_values(tuple(enum.enums))  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType]
 
 
 class Model:
@@ -46,37 +67,52 @@ class Model:
         self.typing_imports: dict[str, set[str]] = defaultdict(set)
         self.base = "DPM"
 
-    def render(self) -> str:
-        """Generate SQLAlchemy models from database metadata."""
-        self.imports["__future__"].add("annotations")
-
+    @cached_property
+    def sorted_tables(self) -> list[Table]:
+        """Tables in dependency order, sorted once per model."""
         # Due to circular FKs we get an SAWarning when doing a topo sort of the tables
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore", category=SAWarning)
-            sorted_tables = self.metadata.sorted_tables
+            return self.metadata.sorted_tables
+
+    def render(self) -> str:
+        """Generate SQLAlchemy models from database metadata."""
+        return "".join(self.stream())
 
-        models = [
-            self._generate_class(table)
-            if table.primary_key or "RowGUID" in table.columns
-            else self._generate_table(table)
-            for table in sorted_tables
-        ]
+    def stream(self) -> Iterator[str]:
+        """Generate SQLAlchemy models from database metadata, chunk by chunk.
 
-        return self._generate_file(models)
+        The models are generated up front as they determine the imports in the header,
+        the file is then produced without joining it into a single string.
+        """
+        self.imports["__future__"].add("annotations")
 
-    def _generate_file(self, models: list[str]) -> str:
-        """Render the complete model file."""
+        # Models are collected as lines and joined once when rendering the file
+        models: list[str] = []
+        for table in self.sorted_tables:
+            if table.primary_key or "RowGUID" in table.columns:
+                models.extend(self._generate_class(table))
+            else:
+                models.append(self._generate_table(table))
+
+        lines = iter(self._generate_file(models))
+        yield next(lines)
+        for line in lines:
+            yield f"\n{line}"
+
+    def _generate_file(self, models: list[str]) -> tuple[str, ...]:
+        """Render the lines of the complete model file."""
         base_class = self._generate_base_class()
         typing_imports = self._generate_typing_imports()
         imports = self._generate_imports()
-        header = [
+        header = (
             '"""SQLAlchemy models generated from DPM by the DPM Toolkit project."""',
             imports,
             typing_imports,
             base_class,
-        ]
+        )
 
-        return "\n".join(header + models)
+        return (*header, *models)
 
     def _generate_base_class(self) -> str:
         """Generate the base class definition."""
@@ -112,16 +148,15 @@ class Model:
         )
 
         self.imports["sqlalchemy"].add("Table as AlchemyTable")
-        return f"""{pascal_case(table.name)} = AlchemyTable(
-            \n{INDENT}{f",\n{INDENT}".join(lines)}\n)\n"""
+        arguments = ",\n".join(f"{INDENT}{line}" for line in lines)
+        return f"{pascal_case(table.name)} = AlchemyTable(\n{arguments}\n)\n"
 
     def _generate_column(self, column: Column[Any]) -> str:
         """Generate a SQLAlchemy column."""
         sql_type = column.type.__class__.__name__
         self.imports["sqlalchemy"].add(sql_type)
         if isinstance(column.type, Enum):
-            enum_values = (f'"{value}"' for value in column.type.enums)  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
-            sql_type = f"Enum({', '.join(sorted(enum_values))})"
+            sql_type = f"Enum({enum_values(column.type)})"
         self.imports["sqlalchemy"].add("Column")
         return (
             f'Column("{column.name}", {sql_type})'
@@ -129,22 +164,20 @@ class Model:
             else f'Column("{column.name}", {sql_type}, nullable={column.nullable})'
         )
 
-    def _generate_class(self, table: Table) -> str:
-        """Generate a SQLAlchemy model for a table."""
-        return "\n".join(
-            (
-                f"class {pascal_case(table.name)}({self.base}):",
-                f'{INDENT}"""Auto-generated model for the {table.name} table."""',
-                f'{INDENT}__tablename__ = "{table.name}"\n',
-                f"{INDENT}# We quote the references to avoid circular dependencies"
-                if table.name == "Concept"
-                else "",
-                *(self._generate_mapped_column(column) for column in table.columns),
-                f"\n{INDENT}{self._generate_mapper_args(table)}"
-                if not table.primary_key
-                else "",
-                *self._generate_relationships(table),
-            ),
+    def _generate_class(self, table: Table) -> tuple[str, ...]:
+        """Generate the lines of a SQLAlchemy model for a table."""
+        return (
+            f"class {pascal_case(table.name)}({self.base}):",
+            f'{INDENT}"""Auto-generated model for the {table.name} table."""',
+            f'{INDENT}__tablename__ = "{table.name}"\n',
+            f"{INDENT}# We quote the references to avoid circular dependencies"
+            if table.name == "Concept"
+            else "",
+            *(self._generate_mapped_column(column) for column in table.columns),
+            f"\n{INDENT}{self._generate_mapper_args(table)}"
+            if not table.primary_key
+            else "",
+            *self._generate_relationships(table),
         )
 
     def _generate_mapper_args(self, table: Table) -> str:
@@ -185,19 +218,13 @@ class Model:
         python_type = column_type.python_type
         python_type_name = python_type.__name__
 
-        if python_type == date:
-            self.typing_imports["datetime"].add("date")
-        elif python_type == datetime:
-            self.typing_imports["datetime"].add("datetime")
-        elif python_type == Decimal:
-            self.typing_imports["decimal"].add("Decimal")
-        elif python_type == UUID:
-            self.typing_imports["uuid"].add("UUID")
+        if typing_import := TYPING_IMPORTS.get(python_type):
+            module, name = typing_import
+            self.typing_imports[module].add(name)
 
         if isinstance(column_type, Enum):
             self.imports["typing"].add("Literal")
-            enum_values = [f'"{enum}"' for enum in column_type.enums]  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
-            python_type_name = f"Literal[{', '.join(sorted(enum_values))}]"
+            python_type_name = f"Literal[{enum_values(column_type)}]"
 
         return f"{python_type_name} | None" if column.nullable else python_type_name
 
@@ -220,45 +247,45 @@ class Model:
         if column.table.name == "Concept":
             # For Concept, we quote the references to avoid circular dependencies
             foreign_keys.extend(
-                f'"{pascal_case(fk.column.table.name)}.{snake_case(fk.column.name)}"'
+                f'ForeignKey("{pascal_case(fk.column.table.name)}.'
+                f'{snake_case(fk.column.name)}")'
                 for fk in column.foreign_keys
             )
         else:
             # Self referential FKs
             foreign_keys.extend(
-                f'"{snake_case(fk.column.name)}"'
+                f'ForeignKey("{snake_case(fk.column.name)}")'
                 if fk.column.name == column.name
-                else snake_case(fk.column.name)
+                else f"ForeignKey({snake_case(fk.column.name)})"
                 for fk in column.foreign_keys
                 if fk.column.table == column.table
             )
             # External pointing FKs
             foreign_keys.extend(
-                f"{pascal_case(fk.column.table.name)}.{snake_case(fk.column.name)}"
+                f"ForeignKey({pascal_case(fk.column.table.name)}."
+                f"{snake_case(fk.column.name)})"
                 for fk in column.foreign_keys
                 if fk.column.table != column.table
             )
 
-        return (foreign_key(fk) for fk in foreign_keys)
+        return foreign_keys
 
     def _generate_relationships(self, table: Table) -> list[str]:
         """Generate SQLAlchemy relationship definitions."""
-        relationships: list[str] = []
+        other_relationships: list[str] = []
+        named_relationships: list[str] = []
 
         # This is split to avoid circular dependencies/race conditions
-        relationships.extend(
-            self._generate_relationship(column, fk.column)
-            for column in table.columns
-            for fk in column.foreign_keys
-            if relation_name(column.name) != fk.column.table.name
-        )
-        relationships.extend(
-            self._generate_relationship(column, fk.column)
-            for column in table.columns
-            for fk in column.foreign_keys
-            if relation_name(column.name) == fk.column.table.name
-        )
-        return relationships
+        for column in table.columns:
+            for fk in column.foreign_keys:
+                relationships = (
+                    named_relationships
+                    if relation_name(column.name) == fk.column.table.name
+                    else other_relationships
+                )
+                relationships.append(self._generate_relationship(column, fk.column))
+
+        return other_relationships + named_relationships
 
     def _generate_relationship(self, src_col: Column[Any], ref_col: Column[Any]) -> str:
         """Generate a SQLAlchemy relationship definition."""
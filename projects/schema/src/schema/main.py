@@ -10,6 +10,9 @@ from schema.generation import Model
 
 logger = getLogger(__name__)
 
+# Buffer size when writing the schema file, coalescing the streamed chunks
+WRITE_BUFFER_SIZE = 1 << 20
+
 
 def generate_schema(source: Path, target: Path) -> None:
     """Generate SQLAlchemy schema from migrated SQLite database.
@@ -38,14 +41,20 @@ def generate_schema(source: Path, target: Path) -> None:
 
     database = create_engine(f"sqlite:///{source}?mode=ro", connect_args={"uri": True})
     metadata = MetaData()
-    metadata.reflect(bind=database)
+    # All tables are reflected on one connection, so referenced tables need no lookup
+    with database.connect() as connection:
+        metadata.reflect(bind=connection, resolve_fks=False)
+    database.dispose()
 
     logger.info("Processing: %s", source.stem)
 
     target.parent.mkdir(parents=True, exist_ok=True)
-    with target.open("w") as model_file:
-        schema = Model(metadata).render()
-        model_file.write(schema)
+    with target.open(
+        "w",
+        encoding="utf-8",
+        buffering=WRITE_BUFFER_SIZE,
+    ) as model_file:
+        model_file.writelines(Model(metadata).stream())
 
     stop_time = datetime.now(UTC)
     logger.info("Generated schema in %s", stop_time - start_time)
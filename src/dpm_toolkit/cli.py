@@ -1,15 +1,17 @@
 """Command line interface for DPM Toolkit."""
 
 import json
-from argparse import ArgumentParser, Namespace
-from collections.abc import Sequence
+from argparse import ArgumentParser, ArgumentTypeError, Namespace
+from collections.abc import Mapping, Sequence
 from datetime import date
 from enum import StrEnum, auto
+from functools import cache
 from pathlib import Path
+from shutil import copyfileobj
 from sys import stdout
 
-import yaml
 from archive import (
+    ChecksumError,
     Source,
     Version,
     compare_version_urls,
@@ -17,15 +19,34 @@ from archive import (
     extract_archive,
     get_version,
     get_versions,
-    get_versions_by_type,
     latest_version,
+    latest_version_by_type,
 )
 
-VERSIONS = get_versions()
-VERSION_IDS = [v["id"] for v in VERSIONS]
 
-RELEASE = latest_version(get_versions_by_type(VERSIONS, "release", "errata"))
-LATEST = latest_version(VERSIONS)
+# The versions are loaded on first use, so commands like --help don't pay for it
+@cache
+def cached_versions() -> list[Version]:
+    """Load the known versions once."""
+    return get_versions()
+
+
+@cache
+def cached_version_ids() -> frozenset[str]:
+    """Get the IDs of the known versions, as a set for validating arguments."""
+    return frozenset(v["id"] for v in cached_versions())
+
+
+@cache
+def cached_release() -> Version:
+    """Get the latest release version."""
+    return latest_version_by_type(cached_versions(), "release", "errata")
+
+
+@cache
+def cached_latest() -> Version:
+    """Get the latest version of any type."""
+    return latest_version(cached_versions())
 
 
 class Format(StrEnum):
@@ -55,30 +76,39 @@ def output_data(
         return
 
     if format_type == Format.JSON:
-        json.dump(
-            data,
-            stdout,
-            default=date_serializer,
-            indent=2 if verbosity == Verbosity.VERBOSE else None,
+        # Encoding to a string at once uses the C encoder and a single write
+        stdout.write(
+            json.dumps(
+                data,
+                default=date_serializer,
+                indent=2 if verbosity == Verbosity.VERBOSE else None,
+            ),
         )
     elif format_type == Format.YAML:
+        # Imported here as it is only needed for this format
+        import yaml
+
         print(yaml.safe_dump(data, default_flow_style=False))
 
     elif format_type == Format.TABLE:
         if isinstance(data, list) and data:
             # Print as table for list of dicts
             if verbosity == Verbosity.VERBOSE:
-                for item in data:
-                    print("\n".join(f"{key}: {value}" for key, value in item.items()))
-                    print("---")
+                # Items are formatted together and printed with a single write
+                print("".join(f"{format_fields(item)}\n---\n" for item in data), end="")
             else:
                 print("\n".join(item["id"] for item in data))
         elif isinstance(data, dict):
-            print("\n".join(f"{key}: {value}" for key, value in data.items()))
+            print(format_fields(data))
         else:
             print(data)
 
 
+def format_fields(item: Mapping[str, object]) -> str:
+    """Format the fields of an item as key: value lines."""
+    return "\n".join(f"{key}: {value}" for key, value in item.items())
+
+
 def log_info(message: str, verbosity: Verbosity = Verbosity.INFO) -> None:
     """Print info message if not quiet."""
     if verbosity == Verbosity.QUIET:
@@ -167,12 +197,20 @@ def add_version_argument(subparser: ArgumentParser) -> None:
     subparser.add_argument(
         "--version",
         "-v",
-        choices=["latest", "release", *VERSION_IDS],
+        type=version_argument,
         default="release",
         help="Version: latest, release, or the version ID (default: %(default)s)",
     )
 
 
+def version_argument(version: str) -> str:
+    """Validate a version argument against the known versions."""
+    if version in ("latest", "release") or version in cached_version_ids():
+        return version
+    msg = f"invalid version: '{version}'"
+    raise ArgumentTypeError(msg)
+
+
 def create_parser() -> ArgumentParser:
     """Create the command line argument parser."""
     parser = ArgumentParser(description="DPM Toolkit CLI tool")
@@ -284,10 +322,10 @@ def handle_version(args: Namespace) -> Version | None:
         return None
 
     if version == "release":
-        return RELEASE
+        return cached_release()
     if version == "latest":
-        return LATEST
-    return get_version(VERSIONS, version)
+        return cached_latest()
+    return get_version(cached_versions(), version)
 
 
 def date_serializer(obj: object) -> str | None:
@@ -303,7 +341,7 @@ def handle_list_command(args: Namespace) -> None:
     if version := handle_version(args):
         output_data(version, args.format, args.verbosity)
         return
-    output_data(VERSIONS, args.format, args.verbosity)
+    output_data(cached_versions(), args.format, args.verbosity)
 
 
 def handle_update_command(args: Namespace) -> None:
@@ -364,15 +402,21 @@ def handle_download_command(args: Namespace) -> None:
         return
 
     log_info(f"Downloading from: {source.get('url', 'unknown')}", args.verbosity)
-    archive = download_source(source)
+    try:
+        archive = download_source(source)
+    except ChecksumError as error:
+        log_info(f"Error: {error}", args.verbosity)
+        return
 
-    if args.extract:
-        extract_archive(archive, target_folder)
-    else:
-        # Write archive bytes to a file inside target_folder
-        target_folder.mkdir(parents=True, exist_ok=True)
-        archive_file = target_folder / source.get("filename", f"{version_id}.archive")
-        archive_file.write_bytes(archive.getbuffer())
+    with archive:
+        if args.extract:
+            extract_archive(archive, target_folder)
+        else:
+            # Write archive bytes to a file inside target_folder
+            target_folder.mkdir(parents=True, exist_ok=True)
+            archive_name = source.get("filename", f"{version_id}.archive")
+            with (target_folder / archive_name).open("wb") as archive_file:
+                copyfileobj(archive, archive_file)
 
     log_info(f"Downloaded version {version_id} to {target_folder}", args.verbosity)
 